@@ -9,7 +9,7 @@
  * - Compile mic-vpio Swift binary (macOS VPIO echo cancellation)
  * - Check for espeak-ng system dependency
  * - Create Python virtual environment
- * - Install mlx-audio and related Python packages
+ * - Install mlx-audio and related Python packages (plus numba and orjson for the server hot paths)
  * - Download spaCy English model
  * - Report whether local TTS is already installed
  */
@@ -33,6 +33,8 @@ const PYTHON_PACKAGES = [
   "num2words",
   "spacy",
   "phonemizer",
+  "numba",
+  "orjson",
 ];
 
 // ============================================================================
@@ -14,6 +14,11 @@ import os
 import sys
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; conversion falls back to NumPy
+    njit = None
+
 # ============================================================================
 # CONSTANTS
 # ============================================================================
@@ -24,6 +29,23 @@ STARTUP_TEXT = "Hi there! I'm Voice CC. How can I help you today?"
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "startup.pcm")
 
+# Output file write buffer size
+WRITE_BUFFER_BYTES = 1 << 20
+
+# float32 -> int16 scale and clip bounds, built once as NumPy scalars so the
+# conversion does not construct them per chunk
+_SCALE = np.float32(32767.0)
+_LO = np.float32(-1.0)
+_HI = np.float32(1.0)
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+# Reusable conversion buffers for float32_to_int16_pcm (grown on demand)
+_f32_scratch = np.empty(0, dtype=np.float32)
+_i16_out = np.empty(0, dtype=np.int16)
+
 # ============================================================================
 # MAIN ENTRYPOINT
 # ============================================================================
@@ -37,42 +59,95 @@ def main():
     print(f"Model loaded (sample_rate={model.sample_rate})")
 
     print(f"Generating: \"{STARTUP_TEXT}\"")
-    chunks = []
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Convert and write each chunk as it arrives, so memory stays constant
+    # regardless of greeting length. Write to a temp file and swap it in only
+    # once generation succeeds, leaving any previous startup.pcm intact on error.
+    tmp_file = OUTPUT_FILE + ".tmp"
+    chunk_count = 0
+    total_samples = 0
+    total_bytes = 0
     try:
-        for result in model.generate(text=STARTUP_TEXT, voice=VOICE, stream=True):
-            audio = np.array(result.audio, copy=False)
-            chunks.append(audio)
-            print(f"  chunk {len(chunks)}: {audio.shape}")
+        with open(tmp_file, "wb", buffering=WRITE_BUFFER_BYTES) as f:
+            for result in model.generate(text=STARTUP_TEXT, voice=VOICE, stream=True):
+                audio = np.asarray(result.audio)
+                chunk_count += 1
+                print(f"  chunk {chunk_count}: {audio.shape}")
+
+                pcm = float32_to_int16_pcm(audio)
+                f.write(pcm)
+                total_samples += audio.size
+                total_bytes += len(pcm)
     except Exception as e:
         print(f"ERROR during generation: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
         sys.exit(1)
 
-    combined = np.concatenate(chunks)
-    pcm = float32_to_int16_pcm(combined)
+    os.replace(tmp_file, OUTPUT_FILE)
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    with open(OUTPUT_FILE, "wb") as f:
-        f.write(pcm)
-
-    duration_s = len(combined) / model.sample_rate
-    print(f"Wrote {len(pcm)} bytes ({duration_s:.1f}s) to {OUTPUT_FILE}")
+    duration_s = total_samples / model.sample_rate
+    print(f"Wrote {total_bytes} bytes ({duration_s:.1f}s) to {OUTPUT_FILE}")
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def float32_to_int16_pcm(audio: np.ndarray) -> bytes:
+def float32_to_int16_pcm(audio: np.ndarray) -> memoryview:
     """
     Convert float32 audio samples (-1.0..1.0) to 16-bit signed PCM bytes.
 
+    Uses the single-pass numba kernel when numba is installed. Otherwise
+    clips into a reusable scratch buffer and scales straight into the int16
+    output, so no full-size temporaries are allocated per chunk. Buffers grow geometrically
+    to fit the largest chunk seen, so the result is only valid until the next
+    call.
+
     @param audio - numpy array of float32 samples
-    @returns Raw bytes of int16 little-endian PCM
+    @returns Byte view of int16 little-endian PCM
     """
-    clamped = np.clip(audio, -1.0, 1.0)
-    int16 = (clamped * 32767).astype(np.int16)
-    return int16.tobytes()
+    global _f32_scratch, _i16_out
+
+    samples = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+    n = samples.size
+    if n > _i16_out.size:
+        _i16_out = np.empty(max(n, 2 * _i16_out.size), dtype=np.int16)
+    out = _i16_out[:n]
+
+    if _f32_to_i16 is not None:
+        _f32_to_i16(samples, out)
+        return out.data.cast("B")
+
+    # Clip into the scratch, then multiply straight into the int16 output
+    # (casting="unsafe" fuses scale and cast): two passes, no astype copy
+    if n > _f32_scratch.size:
+        _f32_scratch = np.empty(max(n, 2 * _f32_scratch.size), dtype=np.float32)
+    scratch = np.clip(samples, _LO, _HI, out=_f32_scratch[:n])
+    np.multiply(scratch, _SCALE, out=out, casting="unsafe")
+    return out.data.cast("B")
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _f32_to_i16(src, dst):
+        """
+        Scale, saturate and cast float32 samples to int16 in a single pass.
+
+        @param src - Contiguous float32 samples (-1.0..1.0)
+        @param dst - int16 output array, at least src.size long
+        """
+        for i in range(src.size):
+            v = src[i] * _SCALE
+            if v > 32767.0:
+                v = 32767.0
+            elif v < -32768.0:
+                v = -32768.0
+            dst[i] = np.int16(v)
+else:
+    _f32_to_i16 = None
 
 
 if __name__ == "__main__":
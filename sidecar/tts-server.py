@@ -10,6 +10,7 @@ Responsibilities:
 - Accept generate/interrupt/quit commands on stdin (JSON lines)
 - Stream raw 16-bit signed PCM audio chunks to stdout (length-prefixed)
 - Support interruption of in-progress generation
+- Run the model on a worker thread so conversion, I/O and interrupts never wait on it
 
 Protocol:
   stdin  (JSON lines):
@@ -27,14 +28,30 @@ Protocol:
     (plus any log output)
 """
 
+import gc
+import os
 import sys
+import ctypes
 import json
 import struct
 import signal
 import threading
+import array
 import queue
+import selectors
+import collections
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; conversion falls back to NumPy
+    njit = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
 # ============================================================================
 # CONSTANTS
 # ============================================================================
@@ -43,12 +60,81 @@ SAMPLE_RATE = 24000
 DEFAULT_MODEL = "prince-canuma/Kokoro-82M"
 DEFAULT_VOICE = "af_heart"
 
+# float32 -> int16 scale and clip bounds, built once as NumPy scalars so the
+# conversion does not construct them per chunk
+_SCALE = np.float32(32767.0)
+_LO = np.float32(-1.0)
+_HI = np.float32(1.0)
+
+# macOS QoS class for latency-critical threads (QOS_CLASS_USER_INTERACTIVE);
+# on Apple Silicon it keeps them on the performance cores
+QOS_CLASS_USER_INTERACTIVE = 0x21
+
+# Raw stdout descriptor for PCM frames (bypasses sys.stdout buffering)
+STDOUT_FD = sys.stdout.buffer.fileno()
+
+# Length prefix packer (writes into a buffer) and the 0-length end-of-generation frame
+_PACK_U32BE = struct.Struct(">I").pack_into
+_END_MARKER = b"\x00\x00\x00\x00"
+
+# Line prefixes of the interrupt/quit commands as serialized by the Node side
+# (JSON.stringify, no spaces, "cmd" first), matched without parsing
+_INTERRUPT_PREFIX = b'{"cmd":"interrupt"'
+_QUIT_PREFIX = b'{"cmd":"quit"'
+_QUIT_CMD = {"cmd": "quit"}
+
+# Stands in for a queued generate cancelled by an interrupt: an empty
+# generate, so it still answers with its end marker
+_CANCELLED_CMD = {"cmd": "generate", "text": ""}
+
+# Max bytes read from stdin per poll
+STDIN_READ_BYTES = 65536
+
+# PCM buffers smaller than this are allocated fresh instead of pooled
+POOL_MIN_BYTES = 4096
+
+# Consecutive chunks needing under half the pooled buffer before it is shrunk
+POOL_IDLE_CHUNKS = 32
+
+# Model chunks are coalesced until a frame holds at least this much PCM
+# (8 KiB ~= 170ms at 24kHz), amortizing per-frame conversion and write overhead
+MIN_FRAME_BYTES = 8192
+
+# Max audio chunks buffered between the generation worker and the main thread
+FRAME_QUEUE_SIZE = 2
+
+# Frame queue marker for the end of one generation (or of the warm-up)
+_END_SENTINEL = object()
+
+# Job queue marker asking the worker to run the warm-up generation
+_WARM_UP = object()
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+# Reusable float32 scratch for the NumPy conversion path (grown on demand)
+_f32_scratch = np.empty(0, dtype=np.float32)
+
+# Pooled int16 PCM output buffer and its idle counter (see acquire_pcm_buffer)
+_pcm_pool = np.empty(0, dtype=np.int16)
+_pcm_pool_idle = 0
+
+# Reusable length-prefix header; only the main thread writes frames
+_hdr = bytearray(4)
+_hdr_view = memoryview(_hdr)
+
+# Model output -> NumPy converter, picked during warm-up (see select_array_converter)
+_to_np = np.asarray
+
 # ============================================================================
 # MAIN HANDLERS
 # ============================================================================
 
 def main():
     """Load model and enter the command loop."""
+    set_interactive_qos()
+
     model_id = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL
     voice = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_VOICE
 
@@ -63,124 +149,462 @@ def main():
 
     log(f"Model loaded (sample_rate={model.sample_rate})")
 
-    # Warm-up: run one short generation to prime the GPU pipeline
+    # Command state, owned by the main thread. Interrupts set a one-byte flag
+    # that the worker polls between chunks: a plain item read, cheaper than
+    # Event.is_set(), and the GIL makes the write visible. Generate/quit
+    # commands wait in the deque.
+    interrupted = array.array("B", [0])
+    cmd_deque = collections.deque()
+
+    # The model runs on a worker thread and hands audio chunks to the main
+    # thread through a small bounded queue, waking it via a pipe. The main
+    # thread converts and writes frames, so it can act on an interrupt while
+    # the model is still busy with a chunk.
+    job_q = queue.Queue()
+    frame_q = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+    wake_r, wake_w = os.pipe()
+    worker = threading.Thread(
+        target=generation_worker,
+        args=(model, voice, job_q, frame_q, interrupted, wake_w),
+        daemon=True,
+    )
+    worker.start()
+
+    # Warm up on the worker, the thread that drives every real generation,
+    # and wait for it to finish before signalling readiness
     log("Warming up...")
-    try:
-        for _ in model.generate(text="Hello.", voice=voice):
-            pass
-        log("Warm-up done")
-    except Exception as e:
-        log(f"WARNING: Warm-up failed: {e}")
+    job_q.put(_WARM_UP)
+    frame_q.get()
+
+    # Move the model and everything loaded so far out of the collector's view,
+    # so the full collection after each generation only scans new objects
+    gc.collect()
+    gc.freeze()
 
     # Signal readiness
     sys.stderr.write("READY\n")
     sys.stderr.flush()
 
-    # State shared between stdin reader thread and main thread
-    interrupted = threading.Event()
-    command_queue = queue.Queue()
-
     # Ignore SIGINT — let the parent Node.js process handle it
     signal.signal(signal.SIGINT, signal.SIG_IGN)
 
-    # Read stdin on a background thread so interrupt commands are processed
-    # immediately, even while handle_generate is running on the main thread.
-    def stdin_reader():
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
+    # stdin and the wake pipe are polled with a selector on the main thread
+    # instead of a reader thread
+    stdin_fd = sys.stdin.fileno()
+    selector = selectors.DefaultSelector()
+    selector.register(stdin_fd, selectors.EVENT_READ)
+    selector.register(wake_r, selectors.EVENT_READ)
+    stdin_buf = bytearray()
+
+    # Current generation: whether the worker is still producing it and whether
+    # its end marker was already sent (on interrupt)
+    busy = False
+    end_sent = False
+
+    def interrupt_now():
+        nonlocal end_sent
+        # Also cancels generates read in the same batch but not yet started
+        interrupted[0] = 1
+        for i, queued in enumerate(cmd_deque):
+            if queued.get("cmd") == "generate":
+                cmd_deque[i] = _CANCELLED_CMD
+
+        # End the generation for the Node side right away rather than after the
+        # model's current chunk; anything it still produces is discarded
+        if busy and not end_sent:
+            write_end_marker()
+            end_sent = True
+        drain_frames()
+
+    def handle_line(line: bytes):
+        # Fast paths: interrupt and quit lines are matched on raw bytes with no
+        # decoding or JSON parsing; only generate (and unusual spacing) is parsed
+        if line.startswith(_INTERRUPT_PREFIX):
+            interrupt_now()
+            return
+        if line.startswith(_QUIT_PREFIX):
+            cmd_deque.append(_QUIT_CMD)
+            return
+
+        line = line.strip()
+        if not line:
+            return
+        try:
+            cmd = json_loads(line)
+        except ValueError as e:  # json and orjson decode errors both subclass it
+            log(f"ERROR: Invalid JSON: {e}")
+            return
+        if not isinstance(cmd, dict):
+            log(f"ERROR: Invalid command: {line[:100]!r}")
+            return
+
+        if cmd.get("cmd") == "interrupt":
+            interrupt_now()
+        else:
+            cmd_deque.append(cmd)
+
+    def read_stdin():
+        data = os.read(stdin_fd, STDIN_READ_BYTES)
+        if not data:
+            # Parent closed stdin: finish what is queued, then exit
+            selector.unregister(stdin_fd)
+            cmd_deque.append(_QUIT_CMD)
+            return
+
+        stdin_buf.extend(data)
+        newline = stdin_buf.find(b"\n")
+        while newline >= 0:
+            handle_line(bytes(stdin_buf[:newline]))
+            del stdin_buf[:newline + 1]
+            newline = stdin_buf.find(b"\n")
+
+    def handle_frame(item):
+        """Write one frame from the worker (or discard it, once interrupted)."""
+        nonlocal busy
+        if item is _END_SENTINEL:
+            if not end_sent:
+                write_end_marker()
+            busy = False
+            # Collect now, between generations, instead of mid-stream
+            gc.enable()
+            gc.collect()
+        elif not interrupted[0]:
+            write_frame(item)
+
+    def drain_frames():
+        """Handle every frame the worker has queued."""
+        while True:
             try:
-                cmd = json.loads(line)
-            except json.JSONDecodeError as e:
-                log(f"ERROR: Invalid JSON: {e}")
-                continue
-
-            if cmd.get("cmd") == "interrupt":
-                interrupted.set()
-            else:
-                command_queue.put(cmd)
-
-    reader = threading.Thread(target=stdin_reader, daemon=True)
-    reader.start()
+                item = frame_q.get_nowait()
+            except queue.Empty:
+                return
+            handle_frame(item)
+
+    def poll(timeout):
+        """Handle stdin commands and worker frames, waiting up to timeout (None = block)."""
+        ready = {key.fd for key, _ in selector.select(timeout)}
+        # stdin first, so an interrupt drops frames that arrived alongside it
+        if stdin_fd in ready:
+            read_stdin()
+        if wake_r in ready:
+            # One frame per wake byte: a frame write can block on the Node
+            # side's playback backpressure, so stdin is checked again before
+            # each one and an interrupt never waits behind the queue. Bytes
+            # left over from frames discarded on interrupt find it empty.
+            os.read(wake_r, 1)
+            try:
+                item = frame_q.get_nowait()
+            except queue.Empty:
+                return
+            handle_frame(item)
 
-    # Main thread: process generate/quit commands from the queue
+    # Main thread: start generate/quit commands in arrival order, one
+    # generation at a time, servicing stdin and frames while waiting
     while True:
-        cmd = command_queue.get()
+        if busy or not cmd_deque:
+            poll(None)
+            continue
+
+        cmd = cmd_deque.popleft()
 
         if cmd.get("cmd") == "generate":
-            interrupted.clear()
-            handle_generate(model, cmd.get("text", ""), voice, interrupted)
+            interrupted[0] = 0
+            text = cmd.get("text", "")
+
+            if not text.strip():
+                write_end_marker()
+                continue
+
+            # No cyclic GC while streaming: a collection pause would stall
+            # frames mid-sentence. Re-enabled when the generation ends.
+            gc.disable()
+            busy = True
+            end_sent = False
+            job_q.put(text)
         elif cmd.get("cmd") == "quit":
             break
         else:
             log(f"ERROR: Unknown command: {cmd.get('cmd')}")
 
+    job_q.put(None)
+    worker.join()
     log("Shutting down")
 
 
-def handle_generate(model, text: str, voice: str, interrupted: threading.Event):
+def generation_worker(model, voice: str, job_q: queue.Queue, frame_q: queue.Queue,
+                      interrupted: array.array, wake_fd: int):
     """
-    Generate audio for the given text and write PCM chunks to stdout.
+    Worker thread: run the warm-up, then each queued generation on the model.
+
+    @param model - The loaded mlx-audio TTS model
+    @param voice - Voice ID (e.g. "af_heart")
+    @param job_q - Texts to synthesize, _WARM_UP, or None to stop the worker
+    @param frame_q - Bounded queue of audio chunks for the main thread
+    @param interrupted - One-byte flag, nonzero when generation should stop
+    @param wake_fd - Write end of the pipe that wakes the main thread
+    """
+    set_interactive_qos()
+
+    while True:
+        text = job_q.get()
+        if text is None:
+            return
+        if text is _WARM_UP:
+            warm_up(model, voice)
+            frame_q.put(_END_SENTINEL)
+            continue
+        handle_generate(model, text, voice, interrupted, frame_q, wake_fd)
+
+
+def warm_up(model, voice: str):
+    """
+    Run one short generation to prime the GPU pipeline on the calling thread.
+
+    Also picks the array converter for the model's output type and
+    JIT-compiles the PCM conversion kernel when numba is available.
+
+    @param model - The loaded mlx-audio TTS model
+    @param voice - Voice ID (e.g. "af_heart")
+    """
+    global _to_np
+
+    try:
+        for result in model.generate(text="Hello.", voice=voice):
+            _to_np = select_array_converter(result.audio)
+            float32_to_int16_pcm(_to_np(result.audio))
+        log("Warm-up done")
+    except Exception as e:
+        log(f"WARNING: Warm-up failed: {e}")
+
+
+def handle_generate(model, text: str, voice: str, interrupted: array.array, frame_q: queue.Queue,
+                    wake_fd: int):
+    """
+    Generate audio for the given text and hand it to the main thread.
 
     @param model - The loaded mlx-audio TTS model
     @param text - Text to synthesize
     @param voice - Voice ID (e.g. "af_heart")
-    @param interrupted - Event flag set when generation should stop
+    @param interrupted - One-byte flag, nonzero when generation should stop
+    @param frame_q - Queue of audio chunks drained by the main thread
+    @param wake_fd - Pipe written after every put so the main thread wakes up
     """
-    if not text.strip():
-        write_end_marker()
-        return
+    def emit(item):
+        frame_q.put(item)
+        os.write(wake_fd, b"\x00")
+
+    pending = []
+    pending_bytes = 0
 
     try:
         results = model.generate(text=text, voice=voice, stream=True)
 
         for result in results:
-            if interrupted.is_set():
+            if interrupted[0]:
                 break
 
-            audio = np.array(result.audio, copy=False)
-            pcm = float32_to_int16_pcm(audio)
-            write_audio_chunk(pcm)
+            audio = _to_np(result.audio)
+            # An empty chunk would become a 0-length frame, i.e. an end marker
+            if not audio.size:
+                continue
+            pending.append(audio)
+            pending_bytes += audio.size * 2
+            if pending_bytes >= MIN_FRAME_BYTES:
+                emit(join_chunks(pending))
+                pending = []
+                pending_bytes = 0
 
     except Exception as e:
         log(f"ERROR: Generation failed: {e}")
 
-    write_end_marker()
+    if pending_bytes and not interrupted[0]:
+        emit(join_chunks(pending))
+    emit(_END_SENTINEL)
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def float32_to_int16_pcm(audio: np.ndarray) -> bytes:
+def float32_to_int16_pcm(audio: np.ndarray) -> memoryview:
     """
     Convert float32 audio samples (-1.0..1.0) to 16-bit signed PCM bytes.
 
+    Uses the single-pass numba kernel when numba is installed, which always
+    saturates. Otherwise clips into a reusable scratch buffer and scales
+    straight into the int16 output, so no full-size temporaries are allocated
+    per chunk. The result is written into the pooled PCM buffer, so it is
+    only valid until the next call.
+
     @param audio - numpy array of float32 samples
-    @returns Raw bytes of int16 little-endian PCM
+    @returns Byte view of int16 little-endian PCM
+    """
+    global _f32_scratch
+
+    samples = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+    n = samples.size
+    out = acquire_pcm_buffer(n)
+
+    if _f32_to_i16 is not None:
+        _f32_to_i16(samples, out)
+        return out.data.cast("B")
+
+    # The multiply writes straight into the int16 output (casting="unsafe"
+    # fuses scale and cast), which does not saturate: samples are clipped to
+    # -1..1 first so nothing wraps around in the cast
+    if n > _f32_scratch.size:
+        _f32_scratch = np.empty(max(n, 2 * _f32_scratch.size), dtype=np.float32)
+    scratch = np.clip(samples, _LO, _HI, out=_f32_scratch[:n])
+    np.multiply(scratch, _SCALE, out=out, casting="unsafe")
+    return out.data.cast("B")
+
+
+def write_frame(audio: np.ndarray):
+    """
+    Convert one audio chunk to int16 PCM and write it.
+
+    @param audio - float32 samples from the model
+    """
+    try:
+        write_audio_chunk(float32_to_int16_pcm(audio))
+    except Exception as e:
+        log(f"ERROR: Audio write failed: {e}")
+
+
+def join_chunks(chunks: list) -> np.ndarray:
+    """
+    Join model audio chunks into a single flat array for one PCM frame.
+
+    @param chunks - Non-empty list of float32 sample arrays
+    @returns The only chunk as-is, or all chunks concatenated
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    return np.concatenate([c.reshape(-1) for c in chunks])
+
+
+def select_array_converter(sample):
+    """
+    Pick the cheapest zero-copy way to view model output as a NumPy array.
+
+    Prefers DLPack when the output type exports it on a CPU-visible device,
+    otherwise falls back to np.asarray (buffer protocol / __array__).
+
+    @param sample - One audio output from the model (e.g. an MLX array)
+    @returns Function mapping a model output to a NumPy array
+    """
+    if hasattr(sample, "__dlpack__"):
+        try:
+            np.from_dlpack(sample)
+            return np.from_dlpack
+        except Exception:
+            pass
+    return np.asarray
+
+
+def acquire_pcm_buffer(n: int) -> np.ndarray:
     """
-    clamped = np.clip(audio, -1.0, 1.0)
-    int16 = (clamped * 32767).astype(np.int16)
-    return int16.tobytes()
+    Return an int16 buffer for n samples, reusing the pooled buffer when possible.
 
+    Requests under POOL_MIN_BYTES get a fresh array. Larger ones share a single
+    buffer sized to the next power of two, which is shrunk once it has been
+    more than twice the needed size for POOL_IDLE_CHUNKS chunks in a row.
 
-def write_audio_chunk(pcm_bytes: bytes):
+    @param n - Number of int16 samples needed
+    @returns int16 array of exactly n samples
     """
-    Write a length-prefixed audio chunk to stdout.
+    global _pcm_pool, _pcm_pool_idle
+
+    if n * 2 < POOL_MIN_BYTES:
+        return np.empty(n, dtype=np.int16)
+
+    capacity = 1 << (n - 1).bit_length()
+    if _pcm_pool.size < n:
+        _pcm_pool = np.empty(capacity, dtype=np.int16)
+        _pcm_pool_idle = 0
+    elif _pcm_pool.size > 2 * capacity:
+        _pcm_pool_idle += 1
+        if _pcm_pool_idle >= POOL_IDLE_CHUNKS:
+            _pcm_pool = np.empty(capacity, dtype=np.int16)
+            _pcm_pool_idle = 0
+    else:
+        _pcm_pool_idle = 0
+
+    return _pcm_pool[:n]
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _f32_to_i16(src, dst):
+        """
+        Scale, saturate and cast float32 samples to int16 in a single pass.
+
+        @param src - Contiguous float32 samples (-1.0..1.0)
+        @param dst - int16 output array, at least src.size long
+        """
+        for i in range(src.size):
+            v = src[i] * _SCALE
+            if v > 32767.0:
+                v = 32767.0
+            elif v < -32768.0:
+                v = -32768.0
+            dst[i] = np.int16(v)
+else:
+    _f32_to_i16 = None
+
+
+def write_audio_chunk(pcm_bytes):
+    """
+    Write a length-prefixed audio chunk to stdout in a single writev call.
 
-    @param pcm_bytes - Raw PCM bytes to write
+    @param pcm_bytes - Raw PCM bytes (or byte memoryview) to write
     """
-    header = struct.pack(">I", len(pcm_bytes))
-    sys.stdout.buffer.write(header)
-    sys.stdout.buffer.write(pcm_bytes)
-    sys.stdout.buffer.flush()
+    _PACK_U32BE(_hdr, 0, len(pcm_bytes))
+    write_all((_hdr_view, pcm_bytes))
 
 
 def write_end_marker():
     """Write a 0-length frame to signal end of generation."""
-    sys.stdout.buffer.write(struct.pack(">I", 0))
-    sys.stdout.buffer.flush()
+    write_all((_END_MARKER,))
+
+
+def write_all(buffers: tuple):
+    """
+    Write buffers to the raw stdout fd, finishing any short write.
+
+    os.writev releases the GIL and usually writes everything in one syscall,
+    but a pipe may accept only part of a large frame.
+
+    @param buffers - Bytes-like objects to write in order
+    """
+    total = sum(len(b) for b in buffers)
+    written = os.writev(STDOUT_FD, buffers)
+    if written == total:
+        return
+
+    remaining = memoryview(b"".join(buffers))[written:]
+    while remaining:
+        remaining = remaining[os.write(STDOUT_FD, remaining):]
+
+
+def set_interactive_qos():
+    """
+    Raise the calling thread to user-interactive QoS on macOS.
+
+    No-op on other platforms, where there is no portable way to tell
+    performance cores apart for sched_setaffinity.
+    """
+    if sys.platform != "darwin":
+        return
+
+    try:
+        libc = ctypes.CDLL(None)
+        err = libc.pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0)
+    except (OSError, AttributeError) as e:
+        log(f"WARNING: Could not set thread QoS: {e}")
+        return
+    if err:
+        log(f"WARNING: Could not set thread QoS (error {err})")
 
 
 def log(msg: str):